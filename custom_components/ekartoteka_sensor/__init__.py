@@ -34,4 +34,7 @@ async def async_setup_entry(hass, config_entry):
 
 async def async_unload_entry(hass, config_entry):
     await hass.config_entries.async_forward_entry_unload(config_entry, "sensor")
+    api = hass.data.get(DOMAIN, {}).pop(config_entry.entry_id, None)
+    if api is not None:
+        await api.async_close()
     return True
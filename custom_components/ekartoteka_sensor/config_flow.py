@@ -22,13 +22,17 @@ class eKartotekaConfigFlow(ConfigFlow, domain="ekartoteka_sensor"):
         errors: Dict[str, str] = {}
         description_placeholders = {"error_info": ""}
         if user_input is not None:
-            api = eKartotekaAPI(user_input[CONF_USERNAME], user_input[CONF_PASSWORD])
+            api = await self.hass.async_add_executor_job(
+                eKartotekaAPI, user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
+            )
             try:
-                await self.hass.async_add_executor_job(api.login)
+                await api.login()
                 return self.async_create_entry(title="eKartoteka sensor", data=user_input)
             except Exception as e:
                 errors = {"login_failed": "verify_connection_failed"}
                 description_placeholders = {"error_info": "eKartoteka Login Failed"}
+            finally:
+                await api.async_close()
         return self.async_show_form(
             step_id="user", data_schema=AUTH_SCHEMA, errors=errors, description_placeholders=description_placeholders
         )
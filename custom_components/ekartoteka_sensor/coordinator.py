@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import copy
 import logging
-import traceback
+import time
 from datetime import timedelta
 
 import voluptuous as vol
@@ -14,12 +16,13 @@ from homeassistant.const import (
     CONF_USERNAME,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
-from .ekartoteka_api import eKartotekaAPI
+from .ekartoteka_api import MAX_CONNECTIONS, eKartotekaAPI
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,13 +36,21 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 # Default polling cadence for the coordinator
 SCAN_INTERVAL = timedelta(hours=24)
 
+# Refetch everything at least this often, even if the summary looks unchanged
+FULL_REFRESH_INTERVAL = timedelta(days=7)
+
+# Stop querying an apartment/sensor pair after this many empty refreshes in a row
+EMPTY_REFRESHES_BEFORE_SKIP = 3
+
 class EkartotekaCoordinator(DataUpdateCoordinator[dict]):
     """Coordinator fetching data for a single house.
 
     coordinator.data schema:
     {
-        "invoice_summary": dict
-        "meters": dict
+        "meters_invoice_summary": dict
+        "meters": { apartment_id: { sensor_id: { "value", "type", "read_date" } } }
+        "sensor_meta": { sensor_id: { "group_id", "unit", "name" } }
+        "last_invoice": dict
         "meta": { "house_id": int, "house_name": str }
     }
     """
@@ -51,105 +62,216 @@ class EkartotekaCoordinator(DataUpdateCoordinator[dict]):
         self.house_name: str = (
             str(house.get("nazwa") or house.get("Nazwa") or self.house_id)
         )
+        # Shared by all invoice summary sensors of this house
+        self.meters_device_info = DeviceInfo(
+            identifiers={("eKartoteka_meters_invoice_sensor", str(self.house_id))},
+            name=f"Meters invoice yearly sum ({self.house_id})",
+            manufacturer="eKartoteka",
+            model="meters_invoice_summary",
+        )
+        # Keeps the request waves within the client's connection pool
+        self._request_limit = asyncio.Semaphore(MAX_CONNECTIONS)
+        # Analysis summary and latest invoice ids seen on the last full refresh,
+        # used to skip unchanged polls
+        self._signature: dict | None = None
+        self._last_full_refresh: float = 0.0
+        # Consecutive empty refreshes per (apartment_id, sensor_id)
+        self._empty_counts: dict[tuple[int, int], int] = {}
+        self._empty_counts_reset_at: float = time.monotonic()
         super().__init__(
             hass,
             _LOGGER,
             name=f"eKartoteka house {self.house_id}",
             update_interval=SCAN_INTERVAL,
+            # data is plain JSON-like dicts/lists, so == tells whether anything changed
+            always_update=False,
+        )
+
+    async def _limited(self, coro):
+        """Await an API call with at most MAX_CONNECTIONS calls in flight."""
+        async with self._request_limit:
+            return await coro
+
+    def _is_unchanged(self, signature: dict) -> bool:
+        """Whether the previous data can be kept for this change signature."""
+        return (
+            self.data is not None
+            and bool(signature["summary"])
+            and signature == self._signature
+            and time.monotonic() - self._last_full_refresh
+            < FULL_REFRESH_INTERVAL.total_seconds()
         )
 
     async def _async_update_data(self) -> dict:
-        """Fetch invoice summary and latest meter readings for all apartments."""
-        try:
-            # Fetch apartments for this house
-            apartment_list = await self.hass.async_add_executor_job(
-                self.api.apartmentList, self.house_id
-            )
+        """Fetch invoice summary and latest meter readings for all apartments.
 
-            # Fetch sensor list once per house (it appears shared across apartments)
-            sensors = await self.hass.async_add_executor_job(
-                self.api.houseSensorList, self.house_id
-            )
+        The yearly analysis summary and each apartment's invoice list are fetched
+        first; if the summary and the latest invoice ids match the previous full
+        refresh, the previous data is returned as-is.
+        """
+        try:
+            await self.api.login()
 
+            # Meters invoice summary for the house (for whole year increasing)
+            inv_list = None
+            try:
+                inv_list = await self.api.houseAnalysisSummary(self.house_id)
+            except Exception as inv_err:
+                _LOGGER.warning(
+                    "Invoice summary failed for house %s: %s", self.house_id, inv_err
+                )
 
-            # Build latest values per (apartment_id, sensor_id)
-            meters: dict[tuple[int, int], dict[str, str | float | int | None]] = {}
-            last_invoice: dict[str, dict] = {}
+            apartment_list = await self.api.apartmentList(self.house_id)
+            apt_ids = []
             for apt in apartment_list:
                 apt_id = apt.get("IdLok")
                 if apt_id is None:
-                    _LOGGER.warning("Empty IdLok in", apartment_list)
+                    _LOGGER.warning("Empty IdLok in %s", apt)
                     continue
-                
-                # Iterate over sensors
-                for s in sensors:
-                    sensor_id = s.get("id_el_op")
-                    if sensor_id is None:
-                        _LOGGER.warning("Empty sensor ", sensor_id, "in", s)
-                        continue
-                    # per original API shape: houseSensorValue(apartment_id, sensor_id)
-                    values = await self.hass.async_add_executor_job(
-                        self.api.houseSensorValue, apt_id, sensor_id
-                    )
-                    value = values[0].get("stan") if values else None
-                    type = values[0].get("typ") if values else None
-                    read_date = values[0].get("data") if values else None
-                    
-                    meters[(int(apt_id), int(sensor_id))] = {
-                        "value": value,
-                        "type": type,
-                        "read_date": read_date
-                    }
-
-                # Iterate over last invoice
-                invoices = await self.hass.async_add_executor_job(
-                    self.api.houseInvoicesList, self.house_id, apt_id
-                )
-                if invoices and invoices[0].get("IdNal", None):
-                    last_invoice_id = invoices[0].get("IdNal")
+                apt_ids.append(apt_id)
 
-                    invoice_entries_list = await self.hass.async_add_executor_job(
-                        self.api.invoiceDetails, apt_id, last_invoice_id
-                    )
-                    for entry in invoice_entries_list:
-                        entry["start_date"] = invoices[0].get("DataOd", None)
-                        entry["end_date"] = invoices[0].get("DataDo", None)
-                        entry["paid"] = invoices[0].get("Stan", None)
-                        entry["apartment_id"] = apt_id
-                        last_invoice[entry.get("Nazwa")] = entry
+            # Rent invoices are independent of the media summary, so the latest
+            # invoice of every apartment is part of the change signature
+            invoice_lists = await asyncio.gather(
+                *[
+                    self._limited(self.api.houseInvoicesList(self.house_id, apt_id))
+                    for apt_id in apt_ids
+                ]
+            )
+            latest_invoices = {}
+            for apt_id, invoices in zip(apt_ids, invoice_lists):
+                invoice = next((inv for inv in invoices if inv.get("IdNal")), None)
+                if invoice is not None:
+                    latest_invoices[apt_id] = invoice
 
-            # Meters invoice summary for the house (for whole year increasing)
+            signature = {
+                "summary": copy.deepcopy(inv_list),
+                "invoices": {
+                    apt_id: invoice.get("IdNal") for apt_id, invoice in latest_invoices.items()
+                },
+            }
+            if self._is_unchanged(signature):
+                _LOGGER.debug("No changes for house %s, skipping refresh", self.house_id)
+                return self.data
+
+            # Sensor list (appears shared across apartments)
+            sensors = await self.api.houseSensorList(self.house_id)
+
+            sensor_ids = []
+            sensor_meta: dict[int, dict] = {}
+            for s in sensors:
+                sensor_id = s.get("id_el_op")
+                if sensor_id is None:
+                    _LOGGER.warning("Empty sensor id in %s", s)
+                    continue
+                sensor_ids.append(sensor_id)
+                sensor_meta[int(sensor_id)] = {
+                    "group_id": s.get("id_gru"),
+                    "unit": (s.get("jm") or "").strip(),
+                    "name": s.get("nazwa") or str(sensor_id),
+                }
+
+            # Pairs that stayed empty on several refreshes in a row are skipped;
+            # the counters are cleared every FULL_REFRESH_INTERVAL, whatever
+            # triggered this refresh, so skipped pairs get queried again
+            now = time.monotonic()
+            if now - self._empty_counts_reset_at >= FULL_REFRESH_INTERVAL.total_seconds():
+                self._empty_counts.clear()
+                self._empty_counts_reset_at = now
+
+            all_keys = [
+                (int(apt_id), int(sensor_id))
+                for apt_id in apt_ids
+                for sensor_id in sensor_ids
+            ]
+            value_keys = [
+                key for key in all_keys
+                if self._empty_counts.get(key, 0) < EMPTY_REFRESHES_BEFORE_SKIP
+            ]
+
+            # Sensor readings for the remaining pairs, and the last invoice details
+            # for apartments that have one
+            # per original API shape: houseSensorValue(apartment_id, sensor_id)
+            results = await asyncio.gather(
+                *[
+                    self._limited(self.api.houseSensorValue(apt_id, sensor_id))
+                    for apt_id, sensor_id in value_keys
+                ],
+                *[
+                    self._limited(self.api.invoiceDetails(apt_id, invoice.get("IdNal")))
+                    for apt_id, invoice in latest_invoices.items()
+                ],
+            )
+            sensor_values = dict(zip(value_keys, results[:len(value_keys)]))
+            details = results[len(value_keys):]
+
+            for key, values in sensor_values.items():
+                if values:
+                    self._empty_counts.pop(key, None)
+                else:
+                    self._empty_counts[key] = self._empty_counts.get(key, 0) + 1
+
+            # Build latest values per apartment_id -> sensor_id. Skipped pairs are
+            # still published (without a reading) so their entities stay in place.
+            meters: dict[int, dict[int, dict[str, str | float | int | None]]] = {}
+            for apt_id, sensor_id in all_keys:
+                latest = next(iter(sensor_values.get((apt_id, sensor_id)) or []), None) or {}
+                value = latest.get("stan")
+                type = latest.get("typ")
+                read_date = latest.get("data")
+
+                meters.setdefault(apt_id, {})[sensor_id] = {
+                    "value": value,
+                    "type": type,
+                    "read_date": read_date
+                }
+
+            last_invoice: dict[str, dict] = {}
+            for (apt_id, invoice), invoice_entries_list in zip(latest_invoices.items(), details):
+                for entry in invoice_entries_list:
+                    entry["start_date"] = invoice.get("DataOd", None)
+                    entry["end_date"] = invoice.get("DataDo", None)
+                    entry["paid"] = invoice.get("Stan", None)
+                    entry["apartment_id"] = apt_id
+                    last_invoice[entry.get("Nazwa")] = entry
+
+            # Entity setup reads the summary rows from here, so keep every row even
+            # when its cost lookup fails.
             meters_invoice_summary: dict[int, dict]= {}
-            try:
-                inv_list = await self.hass.async_add_executor_job(
-                    self.api.houseAnalysisSummary, self.house_id
-                )
-                if inv_list:
-                    for inv in inv_list:
-                        _LOGGER.error(inv)
-                        sensor_cost = await self.hass.async_add_executor_job(
-                            self.api.houseSensorCost, self.house_id, inv["id_el_op"]
-                        )
-                        _LOGGER.error(sensor_cost)
-                        if sensor_cost:
-                            inv["cost"] = sensor_cost[0]["zuzycieFaktyczne"]
-                            inv["amount"] = sensor_cost[0]["zuzycieFaktyczneJM"]
-                        
-                        meters_invoice_summary[inv["id_el_op"]] = inv
-                        
-            except Exception as inv_err:
-                _LOGGER.warning(
-                    "Invoice summary failed for house %s: %s", self.house_id, inv_err
-                )
+            summary_rows = [inv for inv in inv_list or [] if inv.get("id_el_op")]
+            sensor_costs = await asyncio.gather(
+                *[
+                    self._limited(self.api.houseSensorCost(self.house_id, inv["id_el_op"]))
+                    for inv in summary_rows
+                ],
+                return_exceptions=True,
+            )
+            for inv, sensor_cost in zip(summary_rows, sensor_costs):
+                _LOGGER.debug("summary %s / cost %s", inv, sensor_cost)
+                if isinstance(sensor_cost, Exception):
+                    _LOGGER.warning(
+                        "Cost lookup failed for house %s sensor %s: %s",
+                        self.house_id, inv["id_el_op"], sensor_cost
+                    )
+                elif sensor_cost:
+                    inv["cost"] = sensor_cost[0].get("zuzycieFaktyczne")
+                    inv["amount"] = sensor_cost[0].get("zuzycieFaktyczneJM")
+
+                meters_invoice_summary[inv["id_el_op"]] = inv
+
+            self._signature = signature
+            self._last_full_refresh = time.monotonic()
 
             return {
                 "meters_invoice_summary": meters_invoice_summary,
                 "meters": meters,
+                "sensor_meta": sensor_meta,
                 "meta": {"house_id": self.house_id, "house_name": self.house_name},
                 "last_invoice": last_invoice
             }
 
         except Exception as err:
-            _LOGGER.error(traceback.format_exc())
+            # UpdateFailed is logged by the coordinator; keep the traceback for debugging
+            _LOGGER.debug("eKartoteka update failed", exc_info=True)
             raise UpdateFailed(f"Unable to update eKartoteka data: {err}") from err
 
@@ -3,46 +3,115 @@ eKartoteka API wrapper used by the sensor platform.
 
 Notes
 -----
-- Uses a single `requests.Session` for connection reuse.
+- Fully async: uses a single `httpx.AsyncClient` whose connection pool keeps TLS
+  connections alive across concurrent requests. Connection errors are retried
+  by the transport, transient 5xx responses are retried with backoff.
+- The client loads certificates when created, so construct the API outside the
+  event loop (e.g. via `hass.async_add_executor_job`) and `async_close()` it
+  when done.
 - Two token types are used by the backend:
   * auth_token: acquired via `/api-token-auth/`, used to fetch account metadata
   * token:      per-account token returned in account details; used for most data queries
-- Timestamps for cache-busting params use `utcnow().timestamp() * 1000`.
+- `login()` must be awaited once before using the public API; it is idempotent and
+  safe to await concurrently. A 401 only refreshes the tokens, the account/group ids are kept.
+  `export_session()` / `restore_session()` let callers persist the result across restarts;
+  `on_session_change` is notified whenever a (re)login produced new tokens.
+- Slow-changing listings (houses, apartments, sensors, analysis summary) are
+  cached in memory for `cache_ttl` seconds so platform setup and the first
+  coordinator refresh share a single round-trip.
+- No cache-busting query params are sent. Instead, ETag / Last-Modified
+  validators are remembered per URL and replayed as conditional GETs; a 304
+  reuses the previously decoded body.
 """
 from __future__ import annotations
 
-from typing import Dict, Any, Optional
-from datetime import datetime
-import requests
+from typing import Callable, Dict, Any, Optional
+import asyncio
+import copy
+import functools
+import httpx
 import logging
+import orjson
+import time
 
 _LOGGER = logging.getLogger(__name__)
 
 # ---------- Endpoints ----------
+# Per-sensor/per-invoice URLs (sensor_value, monthly_rental, monthly_meters_cost)
+# are built with inline f-strings in their hot-path methods; the templates here
+# document the endpoints.
 login_url = "https://www.e-kartoteka.pl/api/api-token-auth/"
 accounts_list = "https://www.e-kartoteka.pl/api/konta/kontapowiazane/?pageSize=50"
 account_details = "https://www.e-kartoteka.pl/api/konta/kontapowiazane/{0}/"
 groups = "https://www.e-kartoteka.pl/api/uzytkownicy/grupy/?id_kli={0}&page=1&pageSize=100"
 houses = "https://www.e-kartoteka.pl/api/uzytkownicy/nieruchomosci/?id_gru={0}&id_kli={1}&page=1&pageSize=20"
-apartments = "https://www.e-kartoteka.pl/api/oplatymiesieczne/lokale/?page=1&pageSize=1000&id_a_do={0}&id_kli={1}&_={2}"
+apartments = "https://www.e-kartoteka.pl/api/oplatymiesieczne/lokale/?page=1&pageSize=1000&id_a_do={0}&id_kli={1}"
 
 # Water / heat sensors
-analysis_summary = "https://www.e-kartoteka.pl/api/media/analizazuzycia/?page=1&pageSize=20&id_a_do={0}&id_kli={1}&rok={2}&_={3}"
-sensors_list = "https://www.e-kartoteka.pl/api/liczniki/rodzajemediow/?page=1&pageSize=20&id_a_do={0}&id_gru={1}&_={2}"
-sensor_value = "https://www.e-kartoteka.pl/api/liczniki/liczniki/?page=1&pageSize=20&id_lok={0}&id_el_op={1}&_={2}"
+analysis_summary = "https://www.e-kartoteka.pl/api/media/analizazuzycia/?page=1&pageSize=20&id_a_do={0}&id_kli={1}&rok={2}"
+sensors_list = "https://www.e-kartoteka.pl/api/liczniki/rodzajemediow/?page=1&pageSize=20&id_a_do={0}&id_gru={1}"
+sensor_value = "https://www.e-kartoteka.pl/api/liczniki/liczniki/?page=1&pageSize=1&id_lok={0}&id_el_op={1}"
 
 # Rental fee
-invoices_list = "https://www.e-kartoteka.pl/api/oplatymiesieczne/okresy/?page=1&pageSize=20&id_a_do={0}&id_kli={1}&id_lok={2}&_={3}"
-monthly_rental = "https://www.e-kartoteka.pl/api/oplatymiesieczne/oplatymiesieczneb/?page=1&pageSize=100&id_nal={0}&id_lok={1}&id_kli={2}&_={3}"
-monthly_meters_cost = "https://www.e-kartoteka.pl/api/media/rozliczeniemediow/?page=1&pageSize=20&id_a_do={0}&id_kli={1}&id_el_op={2}&ordering=DataOd&_={3}"
+invoices_list = "https://www.e-kartoteka.pl/api/oplatymiesieczne/okresy/?page=1&pageSize=1&id_a_do={0}&id_kli={1}&id_lok={2}"
+monthly_rental = "https://www.e-kartoteka.pl/api/oplatymiesieczne/oplatymiesieczneb/?page=1&pageSize=100&id_nal={0}&id_lok={1}&id_kli={2}"
+monthly_meters_cost = "https://www.e-kartoteka.pl/api/media/rozliczeniemediow/?page=1&pageSize=20&id_a_do={0}&id_kli={1}&id_el_op={2}&ordering=DataOd"
+
+# Sent with every request via the client's default headers
+JSON_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "Origin": "https://www.e-kartoteka.pl",
+    "Referer": "https://www.e-kartoteka.pl/",
+    "Host": "www.e-kartoteka.pl",
+}
+
+# ---------- Connection pool ----------
+MAX_CONNECTIONS = 8
+REQUEST_TIMEOUT = 30  # seconds
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_FORCELIST = (500, 502, 503, 504)
+
+# ---------- Response cache ----------
+CACHE_TTL = 60  # seconds
+
+def _cached(func):
+    """Cache a read-only API call per (method, args) for `self.cache_ttl` seconds.
+
+    Callers get a deep copy so they are free to mutate the returned records.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, *args):
+        key = (func.__name__, *args)
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < self.cache_ttl:
+            return copy.deepcopy(hit[1])
+        value = await func(self, *args)
+        self._cache[key] = (now, value)
+        return copy.deepcopy(value)
+    return wrapper
 
 class eKartotekaAPI:
     """Thin wrapper around eKartoteka REST endpoints."""
 
-    def __init__(self, username: str, password: str) -> None:
+    def __init__(self, username: str, password: str, cache_ttl: float = CACHE_TTL) -> None:
         self.username = username
         self.password = password
-        self.session = requests.Session()
+        self.cache_ttl = cache_ttl
+        self._cache: dict[tuple, tuple[float, Any]] = {}
+        # url -> (etag, last_modified, decoded body)
+        self._validators: dict[str, tuple[str | None, str | None, Any]] = {}
+        limits = httpx.Limits(
+            max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS
+        )
+        self.client = httpx.AsyncClient(
+            headers=JSON_HEADERS,
+            # No pool timeout: callers queue for a connection rather than fail
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, pool=None),
+            transport=httpx.AsyncHTTPTransport(retries=RETRY_TOTAL, limits=limits),
+        )
 
         # tokens/account metadata
         self.auth_token: str = ""
@@ -51,144 +120,209 @@ class eKartotekaAPI:
         self.id_kli: str | int | None = None
         self.id_gru: str | int | None = None
         self.name: str | None = None
+        self._account_id: str | int | None = None
+        self._logged_in = False
+        self._login_lock = asyncio.Lock()
+        # Called with `export_session()` after every successful (re)login
+        self.on_session_change: Callable[[Dict[str, Any]], None] | None = None
 
     # ---------- helpers ----------
-    @staticmethod
-    def _json_headers() -> Dict[str, str]:
-        return {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Origin": "https://www.e-kartoteka.pl",
-            "Referer": "https://www.e-kartoteka.pl/",
-            "Host": "www.e-kartoteka.pl",
-        }
-
-    @staticmethod
-    def _ts_ms() -> int:
-        return int(datetime.utcnow().timestamp() * 1000)
+    def _headers(self, tok: str, url: str | None = None) -> Dict[str, str]:
+        """Per-request headers; the static JSON_HEADERS live on the client."""
+        headers = {"Authorization": f"Bearer {tok}"} if tok else {}
+        cached = self._validators.get(url) if url else None
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
 
-    def _bearer(self, tok: str) -> Dict[str, str]:
-        return {"Authorization": f"Bearer {tok}"} if tok else {}
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying transient 5xx responses with backoff."""
+        for attempt in range(RETRY_TOTAL + 1):
+            resp = await self.client.request(method, url, **kwargs)
+            if resp.status_code not in RETRY_STATUS_FORCELIST or attempt == RETRY_TOTAL:
+                break
+            await asyncio.sleep(RETRY_BACKOFF_FACTOR * (2 ** attempt))
+        return resp
 
-    def _get(self, url: str, *, use_account_token: bool = False) -> Any:
-        """GET with automatic (re)login on 401.
+    async def _get(self, url: str, *, use_account_token: bool = False, reauth: bool = True) -> Any:
+        """Conditional GET with automatic (re)login on 401.
 
         If `use_account_token` is True, uses `self.token`, otherwise `self.auth_token`.
+        Requests issued by the login flow itself pass `reauth=False`.
         """
         token = self.token if use_account_token else self.auth_token
-        headers = {**self._json_headers(), **self._bearer(token)}
-        resp = self.session.get(url, headers=headers, timeout=30)
-        if resp.status_code == 401:
+        resp = await self._send("GET", url, headers=self._headers(token, url))
+        if resp.status_code == 401 and reauth:
             # refresh tokens and retry once
-            self._reset_tokens()
-            self.login()
+            await self._relogin(token, use_account_token=use_account_token)
             token = self.token if use_account_token else self.auth_token
-            headers = {**self._json_headers(), **self._bearer(token)}
-            resp = self.session.get(url, headers=headers, timeout=30)
+            resp = await self._send("GET", url, headers=self._headers(token, url))
+        if resp.status_code == 304 and url in self._validators:
+            return copy.deepcopy(self._validators[url][2])
         if resp.status_code != 200:
             raise Exception(f"GET {url} failed: {resp.status_code} {resp.text}")
-        return resp.json()
+        data = orjson.loads(resp.content)
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._validators[url] = (etag, last_modified, copy.deepcopy(data))
+        return data
 
-    def _post(self, url: str, json: Optional[dict] = None, *, use_account_token: bool = False) -> Any:
+    async def _post(self, url: str, json: Optional[dict] = None, *, use_account_token: bool = False) -> Any:
         token = self.token if use_account_token else self.auth_token
-        headers = {**self._json_headers(), **self._bearer(token)}
-        resp = self.session.post(url, headers=headers, json=json, timeout=30)
+        resp = await self._send("POST", url, headers=self._headers(token), json=json)
         if resp.status_code == 401:
-            self._reset_tokens()
-            self.login()
+            await self._relogin(token, use_account_token=use_account_token)
             token = self.token if use_account_token else self.auth_token
-            headers = {**self._json_headers(), **self._bearer(token)}
-            resp = self.session.post(url, headers=headers, json=json, timeout=30)
+            resp = await self._send("POST", url, headers=self._headers(token), json=json)
         if resp.status_code != 200:
             raise Exception(f"POST {url} failed: {resp.status_code} {resp.text}")
-        return resp.json()
+        return orjson.loads(resp.content)
 
     def _reset_tokens(self) -> None:
+        """Drop tokens only; account/group ids stay valid across re-logins."""
         self.auth_token = ""
         self.token = ""
+        self._logged_in = False
+
+    async def _relogin(self, stale_token: str, *, use_account_token: bool) -> None:
+        """Refresh tokens after a 401, unless a concurrent caller already did."""
+        async with self._login_lock:
+            current = self.token if use_account_token else self.auth_token
+            if current == stale_token:
+                self._reset_tokens()
+            if not self._logged_in:
+                await self._login()
+
+    async def async_close(self) -> None:
+        await self.client.aclose()
+
+    def export_session(self) -> Dict[str, Any]:
+        """Tokens and account ids needed to skip the login flow next time."""
+        return {
+            "auth_token": self.auth_token,
+            "token": self.token,
+            "account_id": self._account_id,
+            "id_usr": self.id_usr,
+            "id_kli": self.id_kli,
+            "id_gru": self.id_gru,
+        }
+
+    def restore_session(self, state: Dict[str, Any]) -> None:
+        """Reuse a session saved by `export_session`; a 401 falls back to login."""
+        self.auth_token = state.get("auth_token", "")
+        self.token = state.get("token", "")
+        self._account_id = state.get("account_id")
+        self.id_usr = state.get("id_usr")
+        self.id_kli = state.get("id_kli")
+        self.id_gru = state.get("id_gru")
+        self._logged_in = bool(
+            self.auth_token and self.token and self.id_kli is not None and self.id_gru is not None
+        )
 
     # ---------- public API ----------
-    def houseList(self) -> Dict:
-        self.login()
-        data = self._get(
+    @_cached
+    async def houseList(self) -> Dict:
+        data = await self._get(
             houses.format(self.id_gru, self.id_kli), use_account_token=True
         )
         return data.get("results", [])
 
-    def apartmentList(self, houseId: int | str) -> Dict:
-        self.login()
-        url = apartments.format(houseId, self.id_kli, self._ts_ms())
-        data = self._get(url, use_account_token=True)
+    @_cached
+    async def apartmentList(self, houseId: int | str) -> Dict:
+        url = apartments.format(houseId, self.id_kli)
+        data = await self._get(url, use_account_token=True)
         return data.get("results", [])
 
     # Whole house analysis summary (sensors)
-    def houseAnalysisSummary(self, houseId: int | str) -> Dict:
-        self.login()
-        url = analysis_summary.format(houseId, self.id_kli, datetime.now().year, self._ts_ms())
-        data = self._get(url, use_account_token=True)
+    @_cached
+    async def houseAnalysisSummary(self, houseId: int | str) -> Dict:
+        url = analysis_summary.format(houseId, self.id_kli, time.localtime().tm_year)
+        data = await self._get(url, use_account_token=True)
         return data.get("results", [])
 
     # House invoices list
-    def houseInvoicesList(self, houseId: int | str, apartmentId: int | str) -> Dict:
-        self.login()
-        url = invoices_list.format(houseId, self.id_kli, apartmentId, self._ts_ms())
-        data = self._get(url, use_account_token=True)
+    async def houseInvoicesList(self, houseId: int | str, apartmentId: int | str) -> Dict:
+        url = invoices_list.format(houseId, self.id_kli, apartmentId)
+        data = await self._get(url, use_account_token=True)
         return data.get("results", [])
 
-    def invoiceDetails(self, apartmentId: int | str, invoiceId: int | str) -> Dict:
-        self.login()
-        url = monthly_rental.format(invoiceId, apartmentId, self.id_kli, self._ts_ms())
-        data = self._get(url, use_account_token=True)
+    async def invoiceDetails(self, apartmentId: int | str, invoiceId: int | str) -> Dict:
+        url = f"https://www.e-kartoteka.pl/api/oplatymiesieczne/oplatymiesieczneb/?page=1&pageSize=100&id_nal={invoiceId}&id_lok={apartmentId}&id_kli={self.id_kli}"
+        data = await self._get(url, use_account_token=True)
         return data.get("results", [])
 
-    def houseSensorList(self, houseId: int | str) -> Dict:
-        self.login()
-        # NOTE: original code mistakenly passed a year here; the endpoint takes houseId, groupId, ts
-        url = sensors_list.format(houseId, self.id_gru, self._ts_ms())
-        data = self._get(url, use_account_token=True)
+    @_cached
+    async def houseSensorList(self, houseId: int | str) -> Dict:
+        # NOTE: original code mistakenly passed a year here; the endpoint takes houseId, groupId
+        url = sensors_list.format(houseId, self.id_gru)
+        data = await self._get(url, use_account_token=True)
         return data.get("results", [])
 
-    def houseSensorValue(self, apartmentId: int | str, sensorId: int | str) -> Dict:
-        self.login()
-        url = sensor_value.format(apartmentId, sensorId, self._ts_ms())
-        data = self._get(url, use_account_token=True)
+    async def houseSensorValue(self, apartmentId: int | str, sensorId: int | str) -> Dict:
+        url = f"https://www.e-kartoteka.pl/api/liczniki/liczniki/?page=1&pageSize=1&id_lok={apartmentId}&id_el_op={sensorId}"
+        data = await self._get(url, use_account_token=True)
         return data.get("results", [])
     
-    def houseSensorCost(self, houseId: int | str, sensorId: int | str) -> Dict:
-        self.login()
-        url = monthly_meters_cost.format(houseId, self.id_kli, sensorId, self._ts_ms())
-        data = self._get(url, use_account_token=True)
+    async def houseSensorCost(self, houseId: int | str, sensorId: int | str) -> Dict:
+        url = f"https://www.e-kartoteka.pl/api/media/rozliczeniemediow/?page=1&pageSize=20&id_a_do={houseId}&id_kli={self.id_kli}&id_el_op={sensorId}&ordering=DataOd"
+        data = await self._get(url, use_account_token=True)
         return data.get("results", [])
 
 
     # ---------- auth ----------
-    def login(self) -> bool:
+    async def login(self) -> bool:
         """Ensure both `auth_token` and per-account `token` are present."""
-        if self.token and self.auth_token:
+        if self._logged_in:
             return True
 
+        async with self._login_lock:
+            if not self._logged_in:
+                await self._login()
+
+        return True
+
+    async def _login(self) -> None:
+        """Run the login flow; the caller must hold `_login_lock`."""
+        await self._refresh_auth_token()
+        await self._bootstrap_account()
+        self._logged_in = True
+        if self.on_session_change is not None:
+            self.on_session_change(self.export_session())
+
+    async def _refresh_auth_token(self) -> None:
+        """Obtain `auth_token` and the per-account `token`."""
         # 1) Obtain auth_token
         payload = {"username": self.username, "password": self.password}
-        resp = self.session.post(login_url, headers=self._json_headers(), json=payload, timeout=30)
+        resp = await self._send("POST", login_url, json=payload)
         if resp.status_code != 200:
             raise Exception(
                 f"Authorization failed for {self.username}. Response {resp.status_code} {resp.text}"
             )
-        self.auth_token = resp.json().get("token", "")
+        self.auth_token = orjson.loads(resp.content).get("token", "")
         if not self.auth_token:
             raise Exception("Login response did not include auth token")
 
-        # 2) Fetch accounts list using auth_token
-        acc_list = self._get(accounts_list, use_account_token=False)
-        results = acc_list.get("results", []) if isinstance(acc_list, dict) else []
-        if not results:
-            raise Exception("No linked accounts returned for user")
-        account_id = results[0].get("id")
-        if account_id is None:
-            raise Exception("Linked account payload missing 'id'")
+        # 2) Fetch accounts list using auth_token (only needed once)
+        if self._account_id is None:
+            acc_list = await self._get(accounts_list, use_account_token=False, reauth=False)
+            results = acc_list.get("results", []) if isinstance(acc_list, dict) else []
+            account = next(iter(results), None)
+            if account is None:
+                raise Exception("No linked accounts returned for user")
+            account_id = account.get("id")
+            if account_id is None:
+                raise Exception("Linked account payload missing 'id'")
+            self._account_id = account_id
 
         # 3) Fetch account details -> provides per-account token
-        details = self._get(account_details.format(account_id), use_account_token=False)
+        details = await self._get(
+            account_details.format(self._account_id), use_account_token=False, reauth=False
+        )
         self.id_usr = details.get("id_usr")
         self.id_kli = details.get("id_kli")
         self.name = details.get("nazwa")
@@ -196,13 +330,17 @@ class eKartotekaAPI:
         if not self.token:
             raise Exception("Account details did not include account token")
 
+    async def _bootstrap_account(self) -> None:
+        """Fetch the group id for this client; cached across re-logins."""
+        if self.id_gru is not None:
+            return
+
         # 4) Fetch groups for this client -> provides id_gru
-        grps = self._get(groups.format(self.id_kli), use_account_token=True)
+        grps = await self._get(groups.format(self.id_kli), use_account_token=True, reauth=False)
         grp_list = grps.get("results", []) if isinstance(grps, dict) else []
-        if not grp_list:
+        group = next(iter(grp_list), None)
+        if group is None:
             raise Exception("Groups list empty for user")
-        self.id_gru = grp_list[0].get("IdGru")
+        self.id_gru = group.get("IdGru")
         if self.id_gru is None:
             raise Exception("Groups payload missing 'IdGru'")
-
-        return True
@@ -4,6 +4,7 @@ from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorStateClass,
 )
+from homeassistant.core import callback
 
 from .base_sensor import EkartotekaBaseEntity
 from .coordinator import EkartotekaCoordinator
@@ -24,6 +25,7 @@ class EkartotekaRentInvoiceEntry(EkartotekaBaseEntity):
         self._unique_id = f"ekartoteka_invoice_entry_{coordinator.house_id}_{entry_name}"
         self._meter_id = entry_name
         self._apartment_id = apartment_id
+        self._update_from_coordinator()
 
     @property
     def icon(self):
@@ -43,15 +45,12 @@ class EkartotekaRentInvoiceEntry(EkartotekaBaseEntity):
             "via_device": None,
         }
 
-    @property
-    def native_value(self):
-        value = self.coordinator.data.get("last_invoice", {}).get(self._meter_id, None) if self.coordinator.data else {}
-        return value.get("Nalicz", None)
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        value = self.coordinator.data.get("last_invoice", {}).get(self._meter_id, None) if self.coordinator.data else None
-        return {
+    def _update_from_coordinator(self) -> None:
+        """Resolve state and attributes once per coordinator update."""
+        data = self.coordinator.data or {}
+        value = (data.get("last_invoice") or {}).get(self._meter_id) or {}
+        self._attr_native_value = value.get("Nalicz", None)
+        self._attr_extra_state_attributes = {
             "count": value.get("WspIle", None),
             "count_unit": value.get("WspIleJM", None),
             "price": value.get("Cena", None),
@@ -70,3 +69,7 @@ class EkartotekaRentInvoiceEntry(EkartotekaBaseEntity):
             "house_name": self.coordinator.house_name
         }
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_coordinator()
+        super()._handle_coordinator_update()
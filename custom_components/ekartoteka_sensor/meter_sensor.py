@@ -4,6 +4,7 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.components.sensor import (
     SensorStateClass,
 )
+from homeassistant.core import callback
 
 from .base_sensor import EkartotekaBaseEntity
 from .coordinator import EkartotekaCoordinator
@@ -33,6 +34,7 @@ class EkartotekaMeterSensor(EkartotekaBaseEntity):
             f"ekartoteka_meter_{coordinator.house_id}_{self.apartment_id}_{self.group_id}_{self.sensor_id}"
         )
         self._apply_unit_mapping(unit)
+        self._update_from_coordinator()
 
     @property
     def icon(self):
@@ -52,19 +54,21 @@ class EkartotekaMeterSensor(EkartotekaBaseEntity):
             "via_device": None,
         }
 
-    @property
-    def native_value(self):
-        meters = self.coordinator.data.get("meters", {}) if self.coordinator.data else {}
-        return meters.get((self.apartment_id, self.sensor_id)).get("value", None)
-    
-    @property
-    def extra_state_attributes(self) -> dict:
-        meters = self.coordinator.data.get("meters", {}) if self.coordinator.data else {}
-        sensor_data = meters.get((self.apartment_id, self.sensor_id), {})
-        return {
+    def _update_from_coordinator(self) -> None:
+        """Resolve state and attributes once per coordinator update."""
+        data = self.coordinator.data or {}
+        apartment_meters = (data.get("meters") or {}).get(self.apartment_id) or {}
+        sensor_data = apartment_meters.get(self.sensor_id) or {}
+        self._attr_native_value = sensor_data.get("value", None)
+        self._attr_extra_state_attributes = {
             "type": sensor_data.get("type", None),
             "read_date": sensor_data.get("read_date", None),
             "house_id": self.coordinator.house_id,
             "house_name": self.coordinator.house_name,
             "apartment_id": self.apartment_id,
         }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_coordinator()
+        super()._handle_coordinator_update()
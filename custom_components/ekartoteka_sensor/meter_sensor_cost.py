@@ -5,6 +5,7 @@ from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorStateClass,
 )
+from homeassistant.core import callback
 
 from .base_sensor import EkartotekaBaseEntity
 from .coordinator import EkartotekaCoordinator
@@ -34,6 +35,11 @@ class EkartotekaMeterSensorCost(EkartotekaBaseEntity):
         self._unique_id = (
             f"ekartoteka_meter_cost_{coordinator.house_id}_{self.sensor_id}"
         )
+        self._attr_extra_state_attributes = {
+            "house_id": coordinator.house_id,
+            "house_name": coordinator.house_name,
+        }
+        self._update_from_coordinator()
 
     @property
     def icon(self):
@@ -53,17 +59,14 @@ class EkartotekaMeterSensorCost(EkartotekaBaseEntity):
             "via_device": None,
         }
 
-    @property
-    def native_value(self):
-        value = self.coordinator.data.get("meters_invoice_summary", {}).get(self.sensor_id, None) if self.coordinator.data else {}
-        return value.get("cost", None)
-    
-    @property
-    def extra_state_attributes(self) -> dict:
-        meters = self.coordinator.data.get("meters", {}) if self.coordinator.data else {}
-        #sensor_data = meters.get((self.apartment_id, self.sensor_id), {})
-        return {
-            "house_id": self.coordinator.house_id,
-            "house_name": self.coordinator.house_name,
-        }
+    def _update_from_coordinator(self) -> None:
+        """Resolve state once per coordinator update."""
+        data = self.coordinator.data or {}
+        value = (data.get("meters_invoice_summary") or {}).get(self.sensor_id) or {}
+        self._attr_native_value = value.get("cost", None)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_coordinator()
+        super()._handle_coordinator_update()
 
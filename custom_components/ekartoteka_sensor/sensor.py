@@ -10,8 +10,8 @@ per house to minimize load and keep entities in sync.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
-import traceback
 from datetime import timedelta
 from typing import Callable, Optional
 
@@ -25,10 +25,12 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONF_PASSWORD,
     CONF_USERNAME,
+    EVENT_HOMEASSISTANT_STOP,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
+from . import DOMAIN
 from .ekartoteka_api import eKartotekaAPI
 from .meter_sensor import EkartotekaMeterSensor
 from .invoice_entry_sensor import EkartotekaRentInvoiceEntry
@@ -48,6 +50,9 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 # Default polling cadence for the coordinator
 SCAN_INTERVAL = timedelta(hours=24)
 
+# Config entry key holding the persisted login session
+CONF_BOOTSTRAP = "_bootstrap"
+
 # -------------------------
 # Setup routines
 # -------------------------
@@ -64,9 +69,9 @@ async def _async_build_entities_for_house(
         # Ensure we have data before creating entities
         await coordinator.async_config_entry_first_refresh()
 
-        # Per-house invoice summary
-        meters_info = await hass.async_add_executor_job(api.houseAnalysisSummary, coordinator.house_id)
-        for meter in meters_info:
+        # Per-house invoice summary, as published by the coordinator
+        meters_invoice_summary = coordinator.data.get("meters_invoice_summary", {})
+        for meter in meters_invoice_summary.values():
             if meter.get("id_el_op", None):
                 entities.append(
                     EkartotekaInvoiceSummarySensor(
@@ -75,7 +80,6 @@ async def _async_build_entities_for_house(
                         meter.get("Nazwa", "")
                     )
                 )
-                _LOGGER.error("test")
                 # Monthly cost per sensor
                 entities.append(
                     EkartotekaMeterSensorCost(
@@ -93,37 +97,41 @@ async def _async_build_entities_for_house(
         # Per-apartment meter entities based on coordinator meta
         meters = coordinator.data.get("meters", {})
 
-        # We need unit and names -> fetch once from houseSensorList
-        sensors = await hass.async_add_executor_job(api.houseSensorList, coordinator.house_id)
-        sensor_meta_by_id = {
-            int(s.get("id_el_op")): {
-                "group_id": s.get("id_gru"),
-                "unit": (s.get("jm") or "").strip(),
-                "name": s.get("nazwa") or str(s.get("id_el_op"))
-            }
-            for s in sensors
-            if s.get("id_el_op") is not None
-        }
-
-        for (apt_id, sensor_id), _ in meters.items():
-            meta = sensor_meta_by_id.get(int(sensor_id))
-            if not meta:
-                continue
-            entities.append(
-                EkartotekaMeterSensor(
-                    coordinator=coordinator,
-                    apartment_id=int(apt_id),
-                    sensor_id=int(sensor_id),
-                    group_id=int(meta.get("group_id")) if meta.get("group_id") is not None else 0,
-                    unit=meta.get("unit", ""),
-                    sensor_name=meta.get("name", str(sensor_id)),
+        # Units and names come from the sensor list fetched by the coordinator
+        sensor_meta_by_id = coordinator.data.get("sensor_meta", {})
+
+        for apt_id, sensor_map in meters.items():
+            for sensor_id in sensor_map:
+                meta = sensor_meta_by_id.get(int(sensor_id))
+                if not meta:
+                    continue
+                entities.append(
+                    EkartotekaMeterSensor(
+                        coordinator=coordinator,
+                        apartment_id=int(apt_id),
+                        sensor_id=int(sensor_id),
+                        group_id=int(meta.get("group_id")) if meta.get("group_id") is not None else 0,
+                        unit=meta.get("unit", ""),
+                        sensor_name=meta.get("name", str(sensor_id)),
+                    )
                 )
-            )
-    except Exception as err:
-        _LOGGER.error(traceback.format_exc())
+    except Exception:
+        _LOGGER.exception("Failed to set up entities for house %s", house.get("IdADo"))
     return entities
 
 
+async def _async_build_entities_for_houses(
+    hass: HomeAssistant, api: eKartotekaAPI, houses: list[dict]
+) -> list[SensorEntity]:
+    # Houses are independent, so their first coordinator refreshes run in parallel.
+    # `api.login()` must have completed already so the houses share one session.
+    results = await asyncio.gather(
+        *[_async_build_entities_for_house(hass, api, house) for house in houses],
+        return_exceptions=True,
+    )
+    return [entity for result in results if isinstance(result, list) for entity in result]
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -131,10 +139,25 @@ async def async_setup_entry(
 ) -> None:
     user = config_entry.data[CONF_USERNAME]
     password = config_entry.data[CONF_PASSWORD]
-    api = eKartotekaAPI(user, password)
+    # The HTTP client loads certificates on creation; keep that off the event loop
+    api = await hass.async_add_executor_job(eKartotekaAPI, user, password)
+    hass.data.setdefault(DOMAIN, {})[config_entry.entry_id] = api
+    # Reuse tokens/ids from the previous run; a 401 falls back to a full login
+    api.restore_session(config_entry.data.get(CONF_BOOTSTRAP, {}))
+
+    # Persist tokens from the initial login and from any later re-login after a 401
+    @callback
+    def _async_save_session(bootstrap: dict) -> None:
+        if config_entry.data.get(CONF_BOOTSTRAP) != bootstrap:
+            hass.config_entries.async_update_entry(
+                config_entry, data={**config_entry.data, CONF_BOOTSTRAP: bootstrap}
+            )
+
+    api.on_session_change = _async_save_session
 
     try:
-        houses = await hass.async_add_executor_job(api.houseList)
+        await api.login()
+        houses = await api.houseList()
     except Exception as err:
         _LOGGER.error("Failed to fetch house list: %s", err)
         return
@@ -143,11 +166,8 @@ async def async_setup_entry(
         _LOGGER.warning("No houses returned by API")
         return
 
-    all_entities: list[SensorEntity] = []
     _LOGGER.debug("Loading houses (config entry)")
-    for house in houses:
-        entities = await _async_build_entities_for_house(hass, api, house)
-        all_entities.extend(entities)
+    all_entities = await _async_build_entities_for_houses(hass, api, houses)
 
     if all_entities:
         async_add_entities(all_entities)
@@ -159,10 +179,19 @@ async def async_setup_platform(
     async_add_entities: Callable,
     discovery_info: Optional[DiscoveryInfoType] = None,
 ) -> None:
-    api = eKartotekaAPI(config.get(CONF_USERNAME), config.get(CONF_PASSWORD))
+    api = await hass.async_add_executor_job(
+        eKartotekaAPI, config.get(CONF_USERNAME), config.get(CONF_PASSWORD)
+    )
+
+    # YAML platforms are never unloaded; release the HTTP client on shutdown
+    async def _async_close_api(_event) -> None:
+        await api.async_close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close_api)
 
     try:
-        houses = await hass.async_add_executor_job(api.houseList)
+        await api.login()
+        houses = await api.houseList()
     except Exception as err:
         _LOGGER.error("Failed to fetch house list: %s", err)
         return
@@ -171,11 +200,8 @@ async def async_setup_platform(
         _LOGGER.warning("No houses returned by API")
         return
 
-    all_entities: list[SensorEntity] = []
     _LOGGER.debug("Loading houses")
-    for house in houses:
-        entities = await _async_build_entities_for_house(hass, api, house)
-        all_entities.extend(entities)
+    all_entities = await _async_build_entities_for_houses(hass, api, houses)
 
     if all_entities:
         async_add_entities(all_entities)
@@ -14,6 +14,7 @@ from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorStateClass,
 )
+from homeassistant.core import callback
 
 from .base_sensor import EkartotekaBaseEntity
 from .coordinator import EkartotekaCoordinator
@@ -24,43 +25,39 @@ class EkartotekaInvoiceSummarySensor(EkartotekaBaseEntity):
     _attr_native_unit_of_measurement = "zl"
     _meter_id = None
     _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_icon = "mdi:cash"
 
     def __init__(self, coordinator: EkartotekaCoordinator, meter_id: int, meter_name) -> None:
         super().__init__(coordinator)
         self._attr_name = (
             f"{meter_name} ({coordinator.house_id})"
         )
-        self._unique_id = f"ekartoteka_meters_invoice_sum_{coordinator.house_id}_{meter_id}"
+        self._attr_unique_id = f"ekartoteka_meters_invoice_sum_{coordinator.house_id}_{meter_id}"
         self._meter_id = meter_id
-
-    @property
-    def icon(self):
-        return "mdi:cash"
-
-    @property
-    def unique_id(self) -> str | None:
-        return self._unique_id
-
-    @property
-    def device_info(self) -> dict:
-        return {
-            "identifiers": {("eKartoteka_meters_invoice_sensor", str(self.coordinator.house_id))},
-            "name": f"Meters invoice yearly sum ({self.coordinator.house_id})",
-            "manufacturer": "eKartoteka",
-            "model": "meters_invoice_summary",
-            "via_device": None,
+        self._attr_device_info = coordinator.meters_device_info
+        self._update_from_coordinator()
+
+    def _row(self) -> dict | None:
+        """Summary row for this meter, or None if the coordinator has none."""
+        data = self.coordinator.data
+        return (data.get("meters_invoice_summary") or {}).get(self._meter_id) if data else None
+
+    def _update_from_coordinator(self) -> None:
+        """Resolve state and attributes once per coordinator update."""
+        row = self._row()
+        self._has_row = row is not None
+        self._attr_native_value = row.get("WynikRozliczenia") if row else None
+        self._attr_extra_state_attributes = {
+            "name": (row or {}).get("Nazwa"),
+            "house_id": self.coordinator.house_id,
+            "house_name": self.coordinator.house_name,
         }
 
     @property
-    def native_value(self):
-        value = self.coordinator.data.get("meters_invoice_summary", {}).get(self._meter_id, None) if self.coordinator.data else {}
-        return value.get("WynikRozliczenia", None)
+    def available(self) -> bool:
+        return super().available and self._has_row
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        value = self.coordinator.data.get("meters_invoice_summary", {}).get(self._meter_id, None) if self.coordinator.data else None
-        return {
-            "name": value.get("Nazwa", None),
-            "house_id": self.coordinator.house_id,
-            "house_name": self.coordinator.house_name,
-        }
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_coordinator()
+        super()._handle_coordinator_update()